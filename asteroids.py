@@ -1,11 +1,14 @@
+import asyncio
 import sys
+import time
 
+import qasync
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QStatusBar, QTextEdit, QFileDialog,
                              QLabel, QWidget, QHBoxLayout, QPushButton, QLineEdit,
-                             QRadioButton, QGridLayout, QFormLayout, QAction, QVBoxLayout)
-from PyQt5.QtCore import Qt, QTimer, QPointF, QRectF
-from PyQt5.QtGui import QKeyEvent, QPalette, QColor, QPainter, QPolygonF, QTransform
-import math
+                             QRadioButton, QGridLayout, QFormLayout, QAction, QVBoxLayout,
+                             QFrame, QGraphicsScene, QGraphicsView)
+from PyQt5.QtCore import Qt, QPointF
+from PyQt5.QtGui import QKeyEvent, QPalette, QColor, QPainter, QPixmap, QPolygonF
 import gameboard
 
 class Asteroids(QWidget):
@@ -16,17 +19,29 @@ class Asteroids(QWidget):
     - frame_height: Height of the game window
     - frame_width: Width of the game window
     - game_running: Flag indicating whether the game is currently running
-    - triangle_pos: Position of the player's triangle [x, y]
     - triangle_size: Size of the player's triangle
     - rotation_angle: Current rotation angle of the player's triangle
     - bullet_radius: Radius of bullets
     - rock_radius: Radius of rocks
+    - rock_release_interval: Time between rock attacks (in milliseconds)
+    - frame_rate: Number of frames rendered per second
+    - tick_rate: Number of physics updates per second
     - gameboard: Instance of the Gameboard class for managing game entities
-    - timer: QTimer for updating the game
-    - create_rock_timer: QTimer for creating rocks at regular intervals
+    - game_task: asyncio task running the game loop
     - start_button: QPushButton to start or restart the game
     - game_over_label: QLabel for displaying "Game Over" message
+    - scene: QGraphicsScene holding the game entities, centred on the player's triangle
+    - view: QGraphicsView rendering the scene over the whole window
     """
+
+    # Vertices of the player's triangle for a size of 1: the tip, then the two
+    # base corners at 7*pi/6 and 11*pi/6 on a circle of radius 1/1.5
+    _TRI_VERTS = [
+        QPointF(0, -1),
+        QPointF(-0.5773502691896257, 1/3),
+        QPointF(0.5773502691896257, 1/3)
+    ]
+
     def __init__(self):
         """
         Initializes a new instance of the Asteroids class.
@@ -39,6 +54,7 @@ class Asteroids(QWidget):
 
         # Flag to track whether game is running
         self.game_running = False
+        self.game_task = None
 
         # Initialize UI components
         self.init_ui()
@@ -54,6 +70,26 @@ class Asteroids(QWidget):
         self.setWindowTitle("Asteroid")
         self.setBackgroundColor(QColor(100, 200, 200))
 
+        # The scene uses game coordinates, with the player's triangle at the origin.
+        # Create the view first so the button and label are stacked above it.
+        self.scene = QGraphicsScene(-self.frame_width/2, -self.frame_height/2,
+                                    self.frame_width, self.frame_height, self)
+        self.scene.setBackgroundBrush(QColor(100, 200, 200))
+
+        # Every item moves each tick, so keeping a BSP index up to date costs more than it saves
+        self.scene.setItemIndexMethod(QGraphicsScene.NoIndex)
+
+        self.view = QGraphicsView(self.scene, self)
+        self.view.setGeometry(0, 0, self.frame_width, self.frame_height)
+        self.view.setFrameShape(QFrame.NoFrame)
+        self.view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.view.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.view.setFocusPolicy(Qt.NoFocus)
+        # Painter state is set once here; the stock items restore whatever they change
+        self.view.setRenderHint(QPainter.Antialiasing)
+        self.view.setOptimizationFlag(QGraphicsView.DontSavePainterState, True)
+        self.view.setViewportUpdateMode(QGraphicsView.BoundingRectViewportUpdate)
+
         # Create start button and game over label
         self.start_button = QPushButton("Start", self)
         self.start_button.clicked.connect(self.start_game)
@@ -83,12 +119,27 @@ class Asteroids(QWidget):
 
 
         # Initialize game variables
-        self.triangle_pos = [self.frame_width/2, self.frame_height/2]
         self.triangle_size = 20
         self.rotation_angle = 0.0
         self.bullet_radius = 5
         self.rock_radius = 20
         self.rock_release_interval = 500
+        self.frame_rate = 60
+        self.tick_rate = 1000
+
+        # Player's triangle centred on the origin, built once per game
+        self._triangle = QPolygonF([vert * self.triangle_size for vert in self._TRI_VERTS])
+
+        # Pre-render sprites shared by the pooled rock and bullet items
+        self._bullet_pm = self.render_circle(self.bullet_radius, QColor(0, 0, 255))
+        self._rock_pm = self.render_circle(self.rock_radius, QColor(0, 0, 200))
+
+        # Reset the scene: the shooter plus empty item pools, grown on demand
+        self.scene.clear()
+        self._shooter_item = self.scene.addPolygon(self._triangle, brush=QColor(255, 0, 0))
+        self._shooter_item.setZValue(1)  # Drawn last, above rocks and bullets
+        self._rock_items = []
+        self._bullet_items = []
 
         # Initialize gameboard instance
         self.gameboard = gameboard.GameArena(self.frame_width, self.frame_height)
@@ -96,27 +147,53 @@ class Asteroids(QWidget):
         # Set game running flag to True
         self.game_running = True
 
-        # Start timers for game update and rock creation
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_game)
-    
-        self.create_rock_timer = QTimer(self)
-        self.create_rock_timer.timeout.connect(self.rock_attack)
+        # Start the loop driving game updates and rock creation
+        if self.game_task is not None:
+            self.game_task.cancel()
+        self.game_task = asyncio.ensure_future(self.game_loop())
+
+    async def game_loop(self):
+        """
+        Runs the game until it ends, scheduling rock attacks and game updates on a monotonic clock.
+
+        Physics advances at a fixed tick rate regardless of the frame rate, so
+        each frame runs however many ticks are due since the previous one.
+        """
+        frame_interval = 1 / self.frame_rate
+        spawn_interval = self.rock_release_interval / 1000
+        tick_interval = 1 / self.tick_rate
+        max_ticks = self.tick_rate // 10  # Don't try to catch up after long stalls
+
+        last_spawn = last_tick = time.monotonic()
+        while self.game_running:
+            await asyncio.sleep(frame_interval)
+            now = time.monotonic()
+
+            if now - last_spawn >= spawn_interval:
+                self.rock_attack()
+                last_spawn = now
+
+            ticks = int((now - last_tick) / tick_interval)
+            if ticks > max_ticks:
+                ticks = max_ticks
+                last_tick = now
+            else:
+                last_tick += ticks * tick_interval
+
+            self.update_game(ticks)
+
 
-        self.timer.start()
-        self.create_rock_timer.start(self.rock_release_interval)
-        
     def end_game(self):
         """
         Ends the game and shows the game over message.
         """
 
-        # Show start button and game over label, stop timers.
+        # Show start button and game over label, the game loop stops by itself.
         self.start_button.show()
         self.game_over_label.show()
 
-        self.timer.stop()
-        self.create_rock_timer.stop()
+        for item in self.scene.items():
+            item.hide()
     
     def rock_attack(self):
         """
@@ -124,74 +201,70 @@ class Asteroids(QWidget):
         """
         self.gameboard.rock_attack()
 
-    def update_game(self):
+    def update_game(self, ticks=1):
         """
-        Updates the game state and triggers repaint.
+        Updates the game state and moves the scene items to match it.
+
+        Parameters:
+        - ticks: Number of physics updates to run before syncing the scene
         """
-        if self.gameboard.check_death():
+        if self.gameboard.update_gameboard(ticks):
             self.game_running = False
             self.end_game()
+            return
 
-        self.gameboard.update_gameboard()
-        self.update()
+        self.sync_items(self._bullet_items, self.gameboard.bullets, self._bullet_pm)
+        self.sync_items(self._rock_items, self.gameboard.rocks, self._rock_pm)
 
-    def draw_rocks(self, painter):
+    def sync_items(self, items, positions, pixmap):
         """
-        Draws rocks on the screen.
+        Moves a pool of pixmap items onto the given positions.
+
+        The pool grows when there are more positions than items, and items
+        without a position are hidden for reuse.
 
         Parameters:
-        - painter: QPainter object for drawing
+        - items: List of QGraphicsPixmapItem forming the pool
+        - positions: Array of positions to show items at, one [x, y] row per entity
+        - pixmap: QPixmap for newly created items
         """
-        painter.setBrush(QColor(0, 0, 200))  # Blue color
-
-        for rock in self.gameboard.rocks:
-            
-            rock_circle = QRectF(QPointF(rock.pos[0]-self.rock_radius, rock.pos[1]-self.rock_radius), 
-                                    QPointF(rock.pos[0]+self.rock_radius, rock.pos[1]+self.rock_radius))
-            rock_circle.translate(self.triangle_pos[0], self.triangle_pos[1])
-            painter.drawEllipse(rock_circle)
-
-    def draw_shooter(self, painter):
+        # Convert to Python floats in one call instead of unboxing NumPy scalars per row
+        for i, (x, y) in enumerate(positions.tolist()):
+            if i < len(items):
+                item = items[i]
+            else:
+                item = self.scene.addPixmap(pixmap)
+                item.setOffset(-pixmap.width()/2, -pixmap.height()/2)
+                items.append(item)
+
+            item.setPos(x, y)
+            item.setVisible(True)
+
+        for item in items[len(positions):]:
+            item.setVisible(False)
+
+    def render_circle(self, radius, color):
         """
-        Draws the player's triangle (shooter) on the screen.
+        Renders a filled circle into a transparent pixmap.
 
         Parameters:
-        - painter: QPainter object for drawing
-        """
-        triangle = QPolygonF([
-            QPointF(0, -self.triangle_size),
-            QPointF(self.triangle_size/1.5*math.cos(7*math.pi/6), -self.triangle_size/1.5*math.sin(7*math.pi/6)),
-            QPointF(self.triangle_size/1.5*math.cos(11*math.pi/6), -self.triangle_size/1.5*math.sin(11*math.pi/6))
-        ])
-        # Draw the triangle 
-        rotation_matrix = QTransform()
-        rotation_matrix.translate(self.triangle_pos[0], self.triangle_pos[1])
-
-        rotation_matrix.rotate(self.rotation_angle)
-
-        rotated_triangle = rotation_matrix.map(triangle)
-        
-        painter.setBrush(QColor(255, 0, 0))  # Red color
-        painter.drawPolygon(rotated_triangle)
+        - radius: Radius of the circle
+        - color: QColor used to fill the circle
 
-    def draw_bullets(self, painter):
+        Returns:
+        - QPixmap: Pixmap with the circle centred in it, including its outline
         """
-        Draws bullets on the screen.
+        center = radius + 1
+        pixmap = QPixmap(2*center, 2*center)
+        pixmap.fill(Qt.transparent)
 
-        Parameters:
-        - painter: QPainter object for drawing
-        """
-    
-        painter.setBrush(QColor(0, 0, 255))  # Blue color
-        
-        for bullet in self.gameboard.bullets:
-            
-            bullet_circle = QRectF(QPointF(bullet.pos[0]-self.bullet_radius, bullet.pos[1]-self.bullet_radius), 
-                                    QPointF(bullet.pos[0]+self.bullet_radius, bullet.pos[1]+self.bullet_radius))
-            
-            bullet_circle.translate(self.triangle_pos[0], self.triangle_pos[1])
-            
-            painter.drawEllipse(bullet_circle)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setBrush(color)
+        painter.drawEllipse(QPointF(center, center), radius, radius)
+        painter.end()
+
+        return pixmap
 
     def setBackgroundColor(self, color):
         """
@@ -205,41 +278,38 @@ class Asteroids(QWidget):
         self.setPalette(palette)
 
 
-    def paintEvent(self, event):
-        """
-        Paint event handler. Called whenever the window needs to be repainted 
-        """
-        if self.game_running is True:
-            painter = QPainter(self)
-            self.draw_shooter(painter)
-            self.draw_bullets(painter)
-            self.draw_rocks(painter)
-        
     def keyPressEvent(self, event):
         """
         Handle key presses for movement and shooting
         """
         turn = 10
 
-        if event.key() == Qt.Key_Left:
-            self.rotation_angle -= turn
-        elif event.key() == Qt.Key_Right:
-            self.rotation_angle += turn
-        elif event.key() == Qt.Key_Space:
-            self.gameboard.shoot(self.rotation_angle)
-        
-        self.rotation_angle % 360
+        key = event.key()
 
-        self.update()
+        if key == Qt.Key_Left:
+            self.rotation_angle = (self.rotation_angle - turn) % 360
+            self._shooter_item.setRotation(self.rotation_angle)
+        elif key == Qt.Key_Right:
+            self.rotation_angle = (self.rotation_angle + turn) % 360
+            self._shooter_item.setRotation(self.rotation_angle)
+        elif key == Qt.Key_Space:
+            self.gameboard.shoot(self.rotation_angle)
 
 
 
 if __name__ == '__main__':
     
     app = QApplication(sys.argv)
+    loop = qasync.QEventLoop(app)
+    asyncio.set_event_loop(loop)
+
+    app_close_event = asyncio.Event()
+    app.aboutToQuit.connect(app_close_event.set)
+
     asteroid = Asteroids()
 
     asteroid.show()
 
-    sys.exit(app.exec_())
+    with loop:
+        loop.run_until_complete(app_close_event.wait())
 
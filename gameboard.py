@@ -1,106 +1,59 @@
+import bisect
 import math
 import random
 
+import numpy as np
 
+import physics
 
-class Rock:
-    """
-    Represents a rock in the game.
 
-    Attributes:
-    - speed: Rock's speed
-    - pos: Current position of the rock [x, y]
-    - direction: Direction of the rock's movement [dx, dy]
-    """
+DEG2RAD = math.pi/180
 
-    def __init__(self, direction, pos):
-        """
-        Initializes a new Rock instance.
+# Squared distances for a bullet hitting a rock, and a rock reaching the player
+COLLIDE_R2 = 20*20
+DEATH_R2 = 30*30
 
-        Parameters:
-        - direction: Initial direction of the rock's movement [dx, dy]
-        - pos: Initial position of the rock [x, y] (default is [0, 0] if not provided)
-        """
-        self.speed = 0.1
-        self.pos = pos if pos is not None else [0, 0]
-        self.direction = direction
+# Number of rocks and bullets the arrays hold before they have to grow
+INITIAL_CAPACITY = 1024
 
-    def update_pos(self):
-        """
-        Updates the position of the rock based on its direction and speed.
-        """
-        self.pos[0] += self.direction[0] * self.speed
-        self.pos[1] += self.direction[1] * self.speed
 
-    def calculate_distance(self):
-        """
-        Calculates the distance traveled by the rock from the origin.
-
-        Returns:
-        - float: Distance traveled by the rock
-        """
-        return math.sqrt(self.pos[0]**2+self.pos[1]**2)
-
-class Bullet:
+def grow(array):
     """
-    Represents a bullet in the game.
+    Doubles the capacity of an entity array.
 
-    Attributes:
-    - speed: Bullet's speed
-    - pos: Current position of the bullet [x, y]
-    - direction: Direction of the bullet's movement [dx, dy]
-    """
-    def __init__(self, direction, pos = None):
-        """
-        Initializes a new Bullet instance.
+    Parameters:
+    - array: Array of shape (N, 2) to grow
 
-        Parameters:
-        - direction: Initial direction of the bullet's movement [dx, dy]
-        - pos: Initial position of the bullet [x, y] (default is [0, 0] if not provided)
-        """
-        self.speed = 1    
-        self.pos = pos if pos is not None else [0, 0]
-        self.direction = direction
-
-    def update_pos(self):
-        """
-        Updates the position of the bullet based on its direction and speed.
-        """
-        self.pos[0] += self.direction[0] * self.speed
-        self.pos[1] += self.direction[1] * self.speed
-
-    def calculate_distance(self):
-        """
-        Calculates the distance traveled by the bullet from the origin.
-
-        Returns:
-        - float: Distance traveled by the bullet
-        """
-        return math.sqrt(self.pos[0]**2+self.pos[1]**2)
-    
-    def distance_to_rock(self, rock_position):
-        """
-        Calculates the distance between the bullet and a rock.
-
-        Parameters:
-        - rock_position: Position of the rock [x, y]
-
-        Returns:
-        - float: Distance between the bullet and the rock
-        """
-        return math.sqrt((self.pos[0]-rock_position[0])**2 + (self.pos[1]-rock_position[1])**2)
-        
+    Returns:
+    - ndarray: New array of shape (2N, 2) starting with the rows of the old one
+    """
+    grown = np.empty((2*len(array), 2), dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
 
 
 class GameArena:
     """
     Represents the game arena containing rocks and bullets.
 
+    Rocks and bullets are stored as structure-of-arrays: one preallocated
+    (capacity, 2) float32 array of positions and one of directions per kind,
+    of which only the first count rows are live.
+
     Attributes:
-    - rocks: List of rocks in the arena
-    - bullets: List of bullets in the arena
+    - rock_pos: Positions of the rocks, shape (capacity, 2)
+    - rock_dir: Directions of the rocks' movement, shape (capacity, 2)
+    - rock_count: Number of live rocks
+    - rock_speed: Speed shared by all rocks
+    - bullet_pos: Positions of the bullets, shape (capacity, 2)
+    - bullet_dir: Directions of the bullets' movement, shape (capacity, 2)
+    - bullet_count: Number of live bullets
+    - bullet_speed: Speed shared by all bullets
     - gameboard_width: Width of the game arena
     - gameboard_height: Height of the game arena
+    - bullet_cull_r2: Squared distance from the origin beyond which bullets are dropped
+    - rock_cull_r2: Squared distance from the origin beyond which rocks are dropped
+    - cell_size: Side length of the collision grid cells
     """
 
     def __init__(self, width, height):
@@ -111,105 +64,118 @@ class GameArena:
         - width: Width of the game arena
         - height: Height of the game arena
         """
-        self.rocks = []
-        self.bullets = []
+        self.rock_pos = np.empty((INITIAL_CAPACITY, 2), dtype=np.float32)
+        self.rock_dir = np.empty_like(self.rock_pos)
+        self.rock_count = 0
+        self.rock_speed = 0.1
+
+        self.bullet_pos = np.empty((INITIAL_CAPACITY, 2), dtype=np.float32)
+        self.bullet_dir = np.empty_like(self.bullet_pos)
+        self.bullet_count = 0
+        self.bullet_speed = 1.0
+
         self.gameboard_width = width
         self.gameboard_height = height
 
+        # Squared distances from the origin beyond which entities are dropped
+        self.bullet_cull_r2 = width*width
+        self.rock_cull_r2 = (2*width)**2
 
-    def shoot(self, angle):
-        """
-        Creates a new bullet and adds it to the list of bullets.
+        # Roughly twice the collision radius, so colliding pairs always
+        # share a cell or sit in neighbouring cells
+        self.cell_size = 40
 
-        Parameters:
-        - angle: Angle at which the bullet is shot (in degrees)
-        """
-        direction = [math.cos(angle*math.pi/180-math.pi/2), math.sin(angle*math.pi/180-math.pi/2)]
-        self.bullets.append(Bullet(direction))
+        # Rocks spawn at a random point along the arena's perimeter, walked
+        # clockwise from the top-left corner. Each edge maps the distance along
+        # it to a position relative to the center, and the rock heads inwards
+        # at a random angle from the edge's range.
+        self._rng = random.Random()
+        self._perimeter = 2*(width+height)
+        self._edge_starts = [width, width+height, 2*width+height]
+        cx = width/2
+        cy = height/2
+        self._spawn_edges = [
+            # (start, x0, y0, x per unit, y per unit, lowest angle, angle range)
+            (0, -cx, -cy, 1, 0, 0, math.pi),                          # Top
+            (width, cx, -cy, 0, 1, math.pi/2, math.pi/2),             # Right
+            (width+height, -cx, cy, 1, 0, math.pi, math.pi),          # Bottom
+            (2*width+height, -cx, -cy, 0, 1, -math.pi/2, math.pi),    # Left
+        ]
 
-    def rock_attack(self):
-        """
-        Initiates a rock attack by creating a new rock with a random initial position and direction.
+    @property
+    def rocks(self):
         """
-        initial_pos = random.randrange(2*(self.gameboard_height+self.gameboard_width))
-        angle = random.uniform(0, 2*math.pi)
-
-        # Determine initial position and direction based on the random value
-        if initial_pos < self.gameboard_width:
-            initial_x = initial_pos
-            initial_y = 0
-            direction = [math.cos(angle), abs(math.sin(angle))]
-        elif initial_pos < self.gameboard_height + self.gameboard_width:
-            initial_x = self.gameboard_width
-            initial_y = initial_pos-self.gameboard_width
-            direction = [-abs(math.cos(angle)), abs(math.sin(angle))]
-        elif initial_pos < 2*self.gameboard_width + self.gameboard_height:
-            initial_x = initial_pos - (self.gameboard_height+self.gameboard_width)
-            initial_y = self.gameboard_height
-            direction = [math.cos(angle), -abs(math.sin(angle))]
-        else:
-            initial_x = 0
-            initial_y = initial_pos -(2*self.gameboard_width+self.gameboard_height)
-            direction = [abs(math.cos(angle)), math.sin(angle)]
-        
-        initial_x -= self.gameboard_width/2
-        initial_y -= self.gameboard_height/2
-
-        pos = [initial_x, initial_y]
-
-        self.rocks.append(Rock(direction, pos))
-    
-    def check_death(self):
-        """
-        Checks if any rocks are close enough to the center to cause game over.
-
-        Returns:
-        - bool: True if the game should end, False otherwise
+        Positions of the rocks in the arena, one [x, y] row per rock.
         """
-        for rock in self.rocks:
-            if math.sqrt(rock.pos[0]**2+rock.pos[1]**2) < 30:
-                return True 
-        else:
-            return False
+        return self.rock_pos[:self.rock_count]
 
-    def check_kill(self):
+    @property
+    def bullets(self):
         """
-        Checks for collisions between bullets and rocks. Removes bullets and rocks involved in collisions.
+        Positions of the bullets in the arena, one [x, y] row per bullet.
         """
-        for i, bullet in reversed(list(enumerate(self.bullets))):
-            for j, rock in reversed(list(enumerate(self.rocks))):
-                if bullet.distance_to_rock(rock.pos) < 20:
-                    self.bullets.pop(i)
-                    self.rocks.pop(j)  
+        return self.bullet_pos[:self.bullet_count]
 
-    def update_gameboard(self):
-        """
-        Updates the game arena by checking and handling collisions, and updating the positions of bullets and rocks.
+    def shoot(self, angle):
         """
-        self.check_kill()
+        Creates a new bullet at the origin and adds it to the bullet arrays, growing them if they are full.
 
-        for i, bullet in reversed(list(enumerate(self.bullets))):
+        Parameters:
+        - angle: Angle at which the bullet is shot (in degrees)
+        """
+        # cos(a - pi/2) = sin(a) and sin(a - pi/2) = -cos(a)
+        a = angle*DEG2RAD
+        direction = [math.sin(a), -math.cos(a)]
 
-            if bullet.calculate_distance() > self.gameboard_width:
-                self.bullets.pop(i)
-            else:
-                bullet.update_pos()
-        
-        for i, rock in reversed(list(enumerate(self.rocks))):
-            if rock.calculate_distance() > 2*self.gameboard_width:
-                self.rocks.pop(i)
-            else:
-                rock.update_pos()
-        
+        if self.bullet_count == len(self.bullet_pos):
+            self.bullet_pos = grow(self.bullet_pos)
+            self.bullet_dir = grow(self.bullet_dir)
 
+        self.bullet_pos[self.bullet_count] = 0, 0
+        self.bullet_dir[self.bullet_count] = direction
+        self.bullet_count += 1
 
+    def rock_attack(self):
+        """
+        Initiates a rock attack by creating a new rock with a random initial position and direction.
+        """
+        rng = self._rng
+        initial_pos = rng.random()*self._perimeter
 
-        
+        # Look up the edge the position falls on
+        edge = self._spawn_edges[bisect.bisect_right(self._edge_starts, initial_pos)]
+        start, x0, y0, x_step, y_step, angle_lo, angle_range = edge
 
+        along = initial_pos - start
+        initial_x = x0 + x_step*along
+        initial_y = y0 + y_step*along
 
-       
+        angle = angle_lo + angle_range*rng.random()
+        direction = [math.cos(angle), math.sin(angle)]
 
+        if self.rock_count == len(self.rock_pos):
+            self.rock_pos = grow(self.rock_pos)
+            self.rock_dir = grow(self.rock_dir)
 
+        self.rock_pos[self.rock_count] = initial_x, initial_y
+        self.rock_dir[self.rock_count] = direction
+        self.rock_count += 1
+    
+    def update_gameboard(self, ticks=1):
+        """
+        Updates the game arena by checking and handling collisions, and updating the positions of bullets and rocks.
 
+        Parameters:
+        - ticks: Number of updates to run, stopping early if the game is over
 
+        Returns:
+        - bool: True if a rock was close enough to the center to cause game over, False otherwise
+        """
+        self.bullet_count, self.rock_count, dead = physics.physics_run(
+            self.bullet_pos, self.bullet_dir, self.bullet_count, self.bullet_speed,
+            self.bullet_cull_r2,
+            self.rock_pos, self.rock_dir, self.rock_count, self.rock_speed,
+            self.rock_cull_r2,
+            self.cell_size, COLLIDE_R2, DEATH_R2, ticks)
 
+        return dead